@@ -7,9 +7,28 @@ https://learn.microsoft.com/en-us/graph/api/resources/onedrive?view=graph-rest-1
 """
 
 
+import asyncio
 import aiohttp
 from dataclasses import dataclass, field
-from typing import Coroutine, Literal
+from typing import (
+    AsyncIterator,
+    Coroutine,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Union,
+)
+from urllib.parse import quote
+from aiopyo365.transfer import (
+    DEFAULT_CHUNK_SIZE,
+    ProgressCallback,
+    TokenBucket,
+    iter_bytes,
+    throttle,
+)
 
 
 @dataclass
@@ -21,11 +40,13 @@ class DriveItems(object):
         auth_client: a client with Microsoft graph auth capabilities
         hostname: name of the host like contoso.com
         site_name: name of sharepoint site to interact with
+        bandwidth_limiter: limiter shared by all the transfers of this client
 
     """
 
     base_url: str
     session: aiohttp.ClientSession
+    bandwidth_limiter: Optional[TokenBucket] = None
     _max_upload_size: int = field(init=False, default=60000000)
 
     async def list_children(self, item_id: str) -> Coroutine:
@@ -44,22 +65,166 @@ class DriveItems(object):
             resp.raise_for_status()
             return await resp.json()
 
-    async def search_item(self, query: str) -> Coroutine:
-        """Search item according to query.
+    async def search_item(
+        self,
+        query: str,
+        select: Optional[List[str]] = None,
+        filter: Optional[str] = None,
+        top: Optional[int] = None,
+    ) -> Coroutine:
+        """Search item according to query. Only the first page of results is returned,
+        use search_items to iterate over all of them.
 
         ref: https://docs.microsoft.com/en-us/graph/api/driveitem-search?view=graph-rest-1.0&tabs=http
         Arg(s):
             query: what to search for in sharepoint from root
+            select: properties of the items to return, all of them if None
+            filter: OData filter expression applied server side
+            top: maximum number of items per page
         Return:
             A Coroutine
         """
         async with self.session.get(
-            f"{self.base_url}/drive/root/search(q='{query}')"
+            self._search_url(query), params=self._odata_params(select, filter, top)
         ) as resp:
             resp.raise_for_status()
             return await resp.json()
 
-    async def upload_small_file(self, content: bytes, file_name: str) -> Coroutine:
+    async def search_items(
+        self,
+        query: str,
+        select: Optional[List[str]] = None,
+        filter: Optional[str] = None,
+        top: Optional[int] = None,
+    ) -> AsyncIterator[Dict]:
+        """Stream items matching query, following pagination links.
+        Next page is only fetched once the items of the current one are consumed,
+        so breaking out of the iteration stops querying the API.
+
+        ref: https://docs.microsoft.com/en-us/graph/api/driveitem-search?view=graph-rest-1.0&tabs=http
+        Arg(s):
+            query: what to search for in sharepoint from root
+            select: properties of the items to return, all of them if None
+            filter: OData filter expression applied server side
+            top: maximum number of items per page
+        Return:
+            An AsyncIterator of driveItem
+        """
+        url = self._search_url(query)
+        params = self._odata_params(select, filter, top)
+        while url:
+            async with self.session.get(url, params=params) as resp:
+                resp.raise_for_status()
+                page = await resp.json()
+            for item in page.get("value", []):
+                yield item
+            # nextLink already carries the query parameters
+            url = page.get("@odata.nextLink")
+            params = None
+
+    async def search_many(
+        self,
+        queries: Iterable[str],
+        select: Optional[List[str]] = None,
+        filter: Optional[str] = None,
+        top: Optional[int] = None,
+        max_concurrency: int = 5,
+    ) -> AsyncIterator[Dict]:
+        """Run several searches concurrently and stream their results.
+        An item matching several queries is only yielded once (based on its id).
+        Pending searches are cancelled when the iteration is stopped.
+
+        Arg(s):
+            queries: what to search for in sharepoint from root
+            select: properties of the items to return, all of them if None.
+                id is always selected as it is used to de-duplicate items
+            filter: OData filter expression applied server side
+            top: maximum number of items per page
+            max_concurrency: maximum number of searches running at the same time
+        Return:
+            An AsyncIterator of driveItem
+        """
+        if select is not None and "id" not in select:
+            select = ["id", *select]
+        semaphore = asyncio.Semaphore(max_concurrency)
+        results: asyncio.Queue = asyncio.Queue(maxsize=max_concurrency * 10)
+        done = object()
+
+        async def _search(query: str) -> None:
+            try:
+                async with semaphore:
+                    async for item in self.search_items(query, select, filter, top):
+                        await results.put(item)
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                await results.put(err)
+            else:
+                await results.put(done)
+
+        tasks = [asyncio.ensure_future(_search(query)) for query in queries]
+        pending = len(tasks)
+        seen: Set[str] = set()
+        try:
+            while pending:
+                item = await results.get()
+                if item is done:
+                    pending -= 1
+                    continue
+                if isinstance(item, Exception):
+                    raise item
+                if item["id"] in seen:
+                    continue
+                seen.add(item["id"])
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _search_url(self, query: str) -> str:
+        """Build the search endpoint for query, escaping it as an OData string literal
+        and percent encoding it.
+
+        Arg(s):
+            query: what to search for in sharepoint from root
+        Return:
+            url of the search endpoint
+        """
+        escaped_query = quote(query.replace("'", "''"), safe="")
+        return f"{self.base_url}/drive/root/search(q='{escaped_query}')"
+
+    @staticmethod
+    def _odata_params(
+        select: Optional[List[str]] = None,
+        filter: Optional[str] = None,
+        top: Optional[int] = None,
+    ) -> Dict[str, str]:
+        """Build OData query parameters, omitting those that are not set.
+
+        Arg(s):
+            select: properties of the items to return
+            filter: OData filter expression
+            top: maximum number of items per page
+        Return:
+            query parameters as a dict
+        """
+        params = {}
+        if select:
+            params["$select"] = ",".join(select)
+        if filter:
+            params["$filter"] = filter
+        if top is not None:
+            params["$top"] = str(top)
+        return params
+
+    async def upload_small_file(
+        self,
+        content: bytes,
+        file_name: str,
+        on_progress: Optional[ProgressCallback] = None,
+        max_bandwidth: Optional[float] = None,
+    ) -> Coroutine:
         """Upload file less than 4 MB to sharepoint.
 
         ref: https://docs.microsoft.com/en-us/graph/api/driveitem-put-content?view=graph-rest-1.0&tabs=http
@@ -67,13 +232,19 @@ class DriveItems(object):
         Arg(s):
             content: content of the file as bytes
             file_name: name to give to the file in sharepoint when uploaded
+            on_progress: called with bytes sent so far and total size
+            max_bandwidth: cap in bytes per second for this transfer
         Return:
             A request Response object
         """
         endpoint = f"{self.base_url}/drive/items/root:/{file_name}:/content"
-        headers = {"Content-Type": "application/octet-stream"}
+        headers = {
+            "Content-Type": "application/octet-stream",
+            "Content-Length": f"{len(content)}",
+        }
+        data = self._upload_payload(content, on_progress, max_bandwidth)
         async with self.session.put(
-            f"{endpoint}", headers=headers, data=content
+            f"{endpoint}", headers=headers, data=data
         ) as resp:
             resp.raise_for_status()
             return await resp.json()
@@ -84,6 +255,8 @@ class DriveItems(object):
         file_byte_size: int,
         filename: str,
         conflict_behavior: Literal["fail", "replace", "rename"] = "fail",
+        on_progress: Optional[ProgressCallback] = None,
+        max_bandwidth: Optional[float] = None,
     ) -> Coroutine:
         """Upload large file (> 4MB) using an upload session. File should be less than 60MB.
         ref: https://docs.microsoft.com/en-us/graph/api/driveitem-createuploadsession?view=graph-rest-1.0#upload-bytes-to-the-upload-session
@@ -93,6 +266,8 @@ class DriveItems(object):
             file_byte_size: size of the file to be uploaded in bytes
             filename: name to give to the file in sharepoint when uploaded
             conflict_behavior: how to handle a file that has already the same name should be one of fail, replace, rename
+            on_progress: called with bytes sent so far and total size
+            max_bandwidth: cap in bytes per second for this transfer
 
         Return:
             A request Response object
@@ -104,7 +279,8 @@ class DriveItems(object):
             "Content-Length": f"{file_byte_size}",
             "Content-Range": f"bytes 0-{file_byte_size-1}/{file_byte_size}",
         }
-        async with self.session.put(upload_url, data=content, headers=headers) as resp:
+        data = self._upload_payload(content, on_progress, max_bandwidth)
+        async with self.session.put(upload_url, data=data, headers=headers) as resp:
             resp.raise_for_status()
             return await resp.json()
 
@@ -136,12 +312,71 @@ class DriveItems(object):
             resp.raise_for_status()
             return await resp.json()
 
-    async def download_file(self, item_id):
+    async def download_file(
+        self,
+        item_id,
+        on_progress: Optional[ProgressCallback] = None,
+        max_bandwidth: Optional[float] = None,
+    ):
+        """Download the content of a file.
+
+        ref: https://learn.microsoft.com/en-us/graph/api/driveitem-get-content?view=graph-rest-1.0&tabs=http
+
+        Arg(s):
+            item_id: id of the file to download
+            on_progress: called with bytes received so far and total size
+            max_bandwidth: cap in bytes per second for this transfer
+        Return:
+            content of the file as bytes
+        """
         async with self.session.get(f"{self.base_url}/drive/items/{item_id}?select=id,@microsoft.graph.downloadUrl") as resp:
             if resp.status == 200:
                 response_json = await resp.json()
                 download_url = response_json["@microsoft.graph.downloadUrl"]
                 async with self.session.get(download_url) as download_resp:
-                    return await download_resp.read()
+                    chunks = throttle(
+                        download_resp.content.iter_chunked(DEFAULT_CHUNK_SIZE),
+                        download_resp.content_length,
+                        self._limiters(max_bandwidth),
+                        on_progress,
+                    )
+                    return b"".join([chunk async for chunk in chunks])
             else:
-                raise ValueError(f"{resp.text}")
\ No newline at end of file
+                raise ValueError(f"{resp.text}")
+
+    def _upload_payload(
+        self,
+        content: bytes,
+        on_progress: Optional[ProgressCallback],
+        max_bandwidth: Optional[float],
+    ) -> Union[bytes, AsyncIterator[bytes]]:
+        """Stream content chunk by chunk when the transfer needs to be
+        monitored or shaped, otherwise send it as is.
+
+        Arg(s):
+            content: content of the file as bytes
+            on_progress: called with bytes sent so far and total size
+            max_bandwidth: cap in bytes per second for this transfer
+        Return:
+            data to send
+        """
+        limiters = self._limiters(max_bandwidth)
+        if on_progress is None and not limiters:
+            return content
+        return throttle(iter_bytes(content), len(content), limiters, on_progress)
+
+    def _limiters(self, max_bandwidth: Optional[float]) -> List[TokenBucket]:
+        """Limiters a transfer should respect: the one shared by the client
+        and a dedicated one when max_bandwidth is set.
+
+        Arg(s):
+            max_bandwidth: cap in bytes per second for this transfer
+        Return:
+            list of limiters
+        """
+        limiters = []
+        if self.bandwidth_limiter is not None:
+            limiters.append(self.bandwidth_limiter)
+        if max_bandwidth is not None:
+            limiters.append(TokenBucket(rate=max_bandwidth))
+        return limiters
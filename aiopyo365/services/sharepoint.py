@@ -5,8 +5,9 @@ from aiopyo365.factories.drive_items import DriveItemsSitesFactory
 from aiopyo365.factories.sites import SitesFactory
 from aiopyo365.ressources.files import DriveItems
 from aiopyo365.ressources.sites import Site
+from aiopyo365.transfer import ProgressCallback, TokenBucket
 from dataclasses import dataclass, field
-from typing import Coroutine
+from typing import AsyncIterator, Coroutine, Dict, Iterable, List, Optional
 
 
 @dataclass
@@ -14,10 +15,16 @@ class SharePointService(object):
     auth_provider: GraphAuthProvider
     hostname: str
     site_name: str
+    max_bandwidth: Optional[float] = None
     _site_client: Site = field(init=False)
     _drive_items_client: DriveItems = field(init=False)
+    _bandwidth_limiter: Optional[TokenBucket] = field(init=False, default=None)
     session: aiohttp.ClientSession = field(init=False)
 
+    def __post_init__(self):
+        if self.max_bandwidth is not None:
+            self._bandwidth_limiter = TokenBucket(rate=self.max_bandwidth)
+
     async def __aenter__(self):
         auth_header = await self.auth_provider.auth()
         self.session = aiohttp.ClientSession(headers=auth_header)
@@ -28,6 +35,7 @@ class SharePointService(object):
         self._drive_items_client = DriveItemsSitesFactory(site_id=site_id).create(
             session=self.session
         )
+        self._drive_items_client.bandwidth_limiter = self._bandwidth_limiter
         return self
 
     async def __aexit__(self, *err):
@@ -46,26 +54,49 @@ class SharePointService(object):
         return resp["id"]
 
     async def upload(
-        self, file_path: str, file_name: str, conflict_behavior="fail"
+        self,
+        file_path: str,
+        file_name: str,
+        conflict_behavior="fail",
+        on_progress: Optional[ProgressCallback] = None,
+        max_bandwidth: Optional[float] = None,
     ) -> Coroutine:
         """Upload file to sharepoint
 
         Arg(s):
             path: path of the file to be uploaded
             file_name: name to give to the file in sharepoint when uploaded
+            on_progress: called with bytes sent so far and total size
+            max_bandwidth: cap in bytes per second for this transfer, on top
+                of the max_bandwidth shared by all transfers of the service
 
         """
         content = self._read_file_as_bytes(file_path)
         file_byte_size = os.path.getsize(file_path)
         if file_byte_size < 4000000:
-            return await self._drive_items_client.upload_small_file(content, file_name)
+            return await self._drive_items_client.upload_small_file(
+                content, file_name, on_progress=on_progress, max_bandwidth=max_bandwidth
+            )
         else:
             return await self._drive_items_client.upload_large_file(
-                content, file_byte_size, file_name, conflict_behavior=conflict_behavior
+                content,
+                file_byte_size,
+                file_name,
+                conflict_behavior=conflict_behavior,
+                on_progress=on_progress,
+                max_bandwidth=max_bandwidth,
             )
 
-    async def download(self, item_id: str, path: str):
-        content = await self._drive_items_client.download_file(item_id)
+    async def download(
+        self,
+        item_id: str,
+        path: str,
+        on_progress: Optional[ProgressCallback] = None,
+        max_bandwidth: Optional[float] = None,
+    ):
+        content = await self._drive_items_client.download_file(
+            item_id, on_progress=on_progress, max_bandwidth=max_bandwidth
+        )
         with open(path, "wb") as file:
             file.write(content)
 
@@ -75,6 +106,59 @@ class SharePointService(object):
     async def search_item(self, query: str):
         return await self._drive_items_client.search_item(query)
 
+    async def search(
+        self,
+        query: str,
+        select: Optional[List[str]] = None,
+        filter: Optional[str] = None,
+        top: Optional[int] = None,
+    ) -> AsyncIterator[Dict]:
+        """Stream all items matching query across result pages.
+
+        Args:
+            query (str): what to search for in sharepoint from root
+            select (List[str], optional): properties to return. Defaults to all.
+            filter (str, optional): OData filter expression. Defaults to None.
+            top (int, optional): maximum number of items per page. Defaults to None.
+
+        Yields:
+            Dict: driveItem matching the query
+        """
+        async for item in self._drive_items_client.search_items(
+            query, select=select, filter=filter, top=top
+        ):
+            yield item
+
+    async def search_many(
+        self,
+        queries: Iterable[str],
+        select: Optional[List[str]] = None,
+        filter: Optional[str] = None,
+        top: Optional[int] = None,
+        max_concurrency: int = 5,
+    ) -> AsyncIterator[Dict]:
+        """Run several searches concurrently and stream de-duplicated items.
+
+        Args:
+            queries (Iterable[str]): what to search for in sharepoint from root
+            select (List[str], optional): properties to return. Defaults to all.
+            filter (str, optional): OData filter expression. Defaults to None.
+            top (int, optional): maximum number of items per page. Defaults to None.
+            max_concurrency (int, optional): searches running at the same time.
+                Defaults to 5.
+
+        Yields:
+            Dict: driveItem matching at least one of the queries
+        """
+        async for item in self._drive_items_client.search_many(
+            queries,
+            select=select,
+            filter=filter,
+            top=top,
+            max_concurrency=max_concurrency,
+        ):
+            yield item
+
     def _read_file_as_bytes(self, path: str) -> bytes:
         """Read a file at path and return its content as bytes
 
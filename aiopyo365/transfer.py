@@ -0,0 +1,125 @@
+""" Helpers to monitor and shape transfers (uploads and downloads).
+
+TokenBucket - bandwidth limiter that can be shared across concurrent transfers.
+throttle - wraps a stream of chunks to report progress and respect limiters.
+"""
+
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass, field
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Optional,
+    Union,
+)
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+ProgressCallback = Callable[[int, Optional[int]], Union[None, Awaitable[None]]]
+"""Called with the number of bytes transferred so far and the total size
+(None when unknown). It can be a function or a coroutine function."""
+
+
+@dataclass
+class TokenBucket(object):
+    """Token bucket bandwidth limiter, one token being one byte.
+    Tokens are granted in order of request so concurrent transfers
+    sharing the same bucket get a fair part of the bandwidth.
+
+    Args:
+        rate (float): bytes per second allowed
+        capacity (float, optional): maximum burst in bytes. Defaults to rate.
+    """
+
+    rate: float
+    capacity: Optional[float] = None
+    _tokens: float = field(init=False)
+    _last_refill: float = field(init=False)
+    _lock: Optional[asyncio.Lock] = field(init=False, default=None)
+
+    def __post_init__(self):
+        if self.rate <= 0:
+            raise ValueError("rate should be greater than 0")
+        if self.capacity is None:
+            self.capacity = self.rate
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+
+    async def acquire(self, amount: int) -> None:
+        """Wait until amount bytes can be transferred.
+
+        Args:
+            amount (int): number of bytes to transfer
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while amount > 0:
+                self._refill()
+                needed = min(amount, self.capacity)
+                if self._tokens < needed:
+                    await asyncio.sleep((needed - self._tokens) / self.rate)
+                    self._refill()
+                self._tokens -= needed
+                amount -= needed
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill, up to capacity."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._last_refill) * self.rate
+        )
+        self._last_refill = now
+
+
+async def throttle(
+    chunks: AsyncIterator[bytes],
+    total: Optional[int] = None,
+    limiters: Iterable[Optional[TokenBucket]] = (),
+    on_progress: Optional[ProgressCallback] = None,
+) -> AsyncIterator[bytes]:
+    """Yield chunks once every limiter granted them and report progress.
+
+    Args:
+        chunks (AsyncIterator[bytes]): chunks to transfer
+        total (int, optional): total size of the transfer. Defaults to None.
+        limiters (Iterable[TokenBucket], optional): limiters to respect, None
+            values are ignored. Defaults to ().
+        on_progress (ProgressCallback, optional): progress callback.
+            Defaults to None.
+
+    Yields:
+        bytes: chunk to transfer
+    """
+    limiters = [limiter for limiter in limiters if limiter is not None]
+    transferred = 0
+    async for chunk in chunks:
+        for limiter in limiters:
+            await limiter.acquire(len(chunk))
+        yield chunk
+        transferred += len(chunk)
+        if on_progress is not None:
+            result = on_progress(transferred, total)
+            if inspect.isawaitable(result):
+                await result
+
+
+async def iter_bytes(
+    content: bytes, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """Split content in chunks of chunk_size bytes.
+
+    Args:
+        content (bytes): content to split
+        chunk_size (int, optional): size of the chunks.
+            Defaults to DEFAULT_CHUNK_SIZE.
+
+    Yields:
+        bytes: chunk of content
+    """
+    for start in range(0, len(content), chunk_size):
+        yield content[start : start + chunk_size]
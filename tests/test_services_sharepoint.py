@@ -80,3 +80,57 @@ async def test_list_files(auth_provider):
         )
 
         assert resp["value"]
+
+
+@pytest.mark.asyncio
+async def test_search(auth_provider):
+    async with SharePointService(
+        auth_provider, os.environ["SHAREPOINT_HOSTNAME"], os.environ["SHAREPOINT_SITE"]
+    ) as sharepoint:
+        items = [
+            item
+            async for item in sharepoint.search(
+                query="Traitements", select=["id", "name"], top=1
+            )
+        ]
+
+        assert items
+        assert all(set(item) <= {"id", "name", "@odata.type"} for item in items)
+
+
+@pytest.mark.asyncio
+async def test_search_many(auth_provider):
+    async with SharePointService(
+        auth_provider, os.environ["SHAREPOINT_HOSTNAME"], os.environ["SHAREPOINT_SITE"]
+    ) as sharepoint:
+        items = [
+            item
+            async for item in sharepoint.search_many(
+                queries=["Traitements", "Traitements"], select=["name"]
+            )
+        ]
+
+        ids = [item["id"] for item in items]
+        assert ids
+        assert len(ids) == len(set(ids))
+
+
+@pytest.mark.asyncio
+async def test_upload_with_progress_and_bandwidth(auth_provider, small_file_path):
+    progress = []
+    async with SharePointService(
+        auth_provider,
+        os.environ["SHAREPOINT_HOSTNAME"],
+        os.environ["SHAREPOINT_SITE"],
+        max_bandwidth=1000000,
+    ) as sharepoint:
+        resp = await sharepoint.upload(
+            small_file_path,
+            "small_file",
+            conflict_behavior="replace",
+            on_progress=lambda sent, total: progress.append((sent, total)),
+            max_bandwidth=500000,
+        )
+        assert resp["createdDateTime"]
+        file_byte_size = os.path.getsize(small_file_path)
+        assert progress[-1] == (file_byte_size, file_byte_size)